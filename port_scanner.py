@@ -12,106 +12,742 @@ Enhancements in this commit:
 Notes:
  - Banner grabbing attempts to be conservative and only sends small probes for HTTP-like ports.
  - TLS-aware banner grabbing uses the ssl module for ports such as 443/8443.
- - Service detection combines socket.getservbyport and banner keyword matching; it's heuristic.
+ - Service detection combines the services database (/etc/services) and banner keyword matching; it's heuristic.
 """
 
 import argparse
+import array
+import asyncio
+import bisect
+import contextlib
+import ctypes
+import errno
+import functools
+import importlib.machinery
+import importlib.util
+import io
 import ipaddress
 import json
+import mmap
+import select
+import selectors
+import signal
 import socket
+import struct
 import sys
+import threading
 import os
+import queue
+import random
 import ssl
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import List, Optional, Tuple
+from typing import Any, BinaryIO, Callable, Iterator, List, Optional, Sequence, Tuple, Union
 
-COMMON_PORTS = [
+try:
+    import resource  # Unix only; keeps asyncio concurrency under RLIMIT_NOFILE
+except ImportError:
+    resource = None  # type: ignore
+
+try:
+    # optional: C serializer for --output-format json, stdlib json otherwise
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None  # type: ignore
+
+
+def _json_bytes(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, default=str)
+    return json.dumps(obj, default=str).encode('utf-8')
+
+COMMON_PORTS = frozenset({
     20, 21, 22, 23, 25, 53, 80, 110, 111, 135, 139, 143, 443, 445, 993,
     995, 1723, 3306, 3389, 5900, 8080, 8443
+})
+
+# Ports that get a TLS handshake / an HTTP HEAD probe when grabbing banners
+TLS_PORTS = frozenset({443, 8443, 9443})
+HTTP_PORTS = frozenset({80, 8080, 8000, 81, 8888, 8008})
+
+# the asyncio engine keeps this many connects in flight per --threads
+ASYNC_CONCURRENCY_FACTOR = 10
+
+# seconds between progress lines (and output flushes) during a range scan
+PROGRESS_INTERVAL = 0.5
+
+# ranges longer than this are split across processes when more than one is allowed
+SHARD_MIN_PORTS = 10000
+
+# SO_SNDBUF/SO_RCVBUF for connect probes; they carry a banner read at most
+PROBE_SOCKET_BUFFER = 4096
+
+# (keyword, service) pairs for banner matching; earlier entries take precedence
+BANNER_KEYWORDS = [
+    ('nginx', 'nginx'),
+    ('apache', 'apache'),
+    ('iis', 'iis'),
+    ('tomcat', 'tomcat'),
+    ('ssh', 'ssh'),
+    ('smtp', 'smtp'),
+    ('esmtp', 'smtp'),
+    ('ftp', 'ftp'),
+    ('mysql', 'mysql'),
+    ('mariadb', 'mysql'),
+    ('postgres', 'postgresql'),
+    ('http', 'http'),
+    ('http/', 'http'),
+    ('ssl', 'ssl'),
+    ('openssl', 'ssl'),
+    ('ssh-', 'ssh'),
+    ('postfix', 'smtp'),
+    ('exim', 'smtp'),
+    ('dovecot', 'imap/pop3'),
+    ('imap', 'imap'),
+    ('pop3', 'pop3'),
+    ('rdp', 'rdp'),
 ]
 
+# The keywords pre-encoded, for bytes `in` tests (C memmem) over a banner
+# lowercased with _LOWER_TABLE in one C pass.
+_BANNER_KEYWORD_BYTES = tuple((key.encode(), name) for key, name in BANNER_KEYWORDS)
+_LOWER_TABLE = bytes.maketrans(bytes(range(65, 91)), bytes(range(97, 123)))
+
+# ---------------------------------------------------------------------------
+# io_uring support (Linux only, driven through ctypes - no extra dependencies)
+# ---------------------------------------------------------------------------
+
+# Syscall numbers are shared by every architecture except alpha since 5.1
+_NR_IO_URING_SETUP = 425
+_NR_IO_URING_ENTER = 426
+_NR_IO_URING_REGISTER = 427
+
+_IORING_SETUP_SINGLE_ISSUER = 1 << 12
+_IORING_SETUP_DEFER_TASKRUN = 1 << 13
+_IORING_FEAT_SINGLE_MMAP = 1 << 0
+_IORING_ENTER_GETEVENTS = 1 << 0
+
+_IORING_REGISTER_FILES = 2
+_IORING_REGISTER_PROBE = 8
+_IO_URING_OP_SUPPORTED = 1 << 0
+
+_IORING_OFF_SQ_RING = 0
+_IORING_OFF_CQ_RING = 0x8000000
+_IORING_OFF_SQES = 0x10000000
+
+_IORING_OP_LINK_TIMEOUT = 15
+_IORING_OP_CONNECT = 16
+_IORING_OP_SEND = 26
+_IORING_OP_RECV = 27
+_IORING_OP_SOCKET = 45
+
+_IOSQE_FIXED_FILE = 1 << 0
+_IOSQE_IO_LINK = 1 << 2
+
+# struct io_uring_sqe / io_uring_cqe as laid out in <linux/io_uring.h>
+_SQE = struct.Struct('<BBHiQQIIQHHiQQ')
+_CQE = struct.Struct('<QiI')
+
+_U16 = struct.Struct('!H')
+# sport, dport, seq, ack, data offset, flags of a TCP reply
+_TCP_REPLY = struct.Struct('!HHIIBB')
+
+# queue.SimpleQueue (3.7+) is a C-level deque with no Condition or Python-level lock,
+# far cheaper per put/get than queue.Queue; the scan workers' hand-off needs nothing more
+_SimpleQueue = getattr(queue, 'SimpleQueue', queue.Queue)
+_ResultQueue = Union[queue.Queue, 'queue.SimpleQueue']
+
+# a scan target: hostname or address text, or an already parsed address (CIDR hosts)
+Target = Union[str, ipaddress.IPv4Address, ipaddress.IPv6Address]
+
+def _cstruct(name: str, fields: list) -> Any:
+    """
+    ctypes.Structure subclass built at runtime rather than with a class statement:
+    mypyc cannot compile classes with a metaclass, and this keeps the module buildable.
+    """
+    return type(name, (ctypes.Structure,), {'_fields_': fields})
+
+
+_SQRingOffsets = _cstruct('_SQRingOffsets', [(name, ctypes.c_uint32) for name in (
+    'head', 'tail', 'ring_mask', 'ring_entries', 'flags', 'dropped', 'array', 'resv1')] + [('user_addr', ctypes.c_uint64)])
+
+_CQRingOffsets = _cstruct('_CQRingOffsets', [(name, ctypes.c_uint32) for name in (
+    'head', 'tail', 'ring_mask', 'ring_entries', 'overflow', 'cqes', 'flags', 'resv1')] + [('user_addr', ctypes.c_uint64)])
+
+_IoUringParams = _cstruct('_IoUringParams', [(name, ctypes.c_uint32) for name in (
+    'sq_entries', 'cq_entries', 'flags', 'sq_thread_cpu', 'sq_thread_idle', 'features', 'wq_fd')] +
+    [('resv', ctypes.c_uint32 * 3), ('sq_off', _SQRingOffsets), ('cq_off', _CQRingOffsets)])
+
+_KernelTimespec = _cstruct('_KernelTimespec', [('tv_sec', ctypes.c_int64), ('tv_nsec', ctypes.c_int64)])
+
+
+class _IoUring:
+    """
+    Minimal io_uring instance: maps the SQ/CQ rings and exposes prep/submit/reap.
+    Raises OSError if the kernel (or a seccomp policy) refuses io_uring_setup.
+    No SQPOLL is used, so the kernel only looks at the rings inside io_uring_enter,
+    which is a full barrier - plain stores/loads on the shared memory are enough.
+    """
+
+    def __init__(self, entries: int, flags: int = 0):
+        if not sys.platform.startswith('linux'):
+            raise OSError(errno.ENOSYS, "io_uring requires Linux")
+        self._libc = ctypes.CDLL(None, use_errno=True)
+        self._libc.syscall.restype = ctypes.c_long
+        params = _IoUringParams()
+        params.flags = flags
+        fd = self._libc.syscall(ctypes.c_long(_NR_IO_URING_SETUP), ctypes.c_long(entries), ctypes.byref(params))
+        if fd < 0 and flags:
+            # SINGLE_ISSUER/DEFER_TASKRUN need 6.0/6.1 - retry with a plain ring
+            params = _IoUringParams()
+            fd = self._libc.syscall(ctypes.c_long(_NR_IO_URING_SETUP), ctypes.c_long(entries), ctypes.byref(params))
+        if fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, f"io_uring_setup: {os.strerror(err)}")
+        self.fd = fd
+        self._maps: List[mmap.mmap] = []
+        try:
+            sq_off, cq_off = params.sq_off, params.cq_off
+            sq_size = sq_off.array + params.sq_entries * 4
+            cq_size = cq_off.cqes + params.cq_entries * _CQE.size
+            if params.features & _IORING_FEAT_SINGLE_MMAP:
+                sq_size = cq_size = max(sq_size, cq_size)
+                self._sq_ring = self._cq_ring = self._map(sq_size, _IORING_OFF_SQ_RING)
+            else:
+                self._sq_ring = self._map(sq_size, _IORING_OFF_SQ_RING)
+                self._cq_ring = self._map(cq_size, _IORING_OFF_CQ_RING)
+            self._sqes = self._map(params.sq_entries * _SQE.size, _IORING_OFF_SQES)
+        except Exception:
+            self.close()
+            raise
+        self.sq_entries = params.sq_entries
+        self._sq_tail = ctypes.c_uint32.from_buffer(self._sq_ring, sq_off.tail)
+        self._sq_mask = ctypes.c_uint32.from_buffer(self._sq_ring, sq_off.ring_mask).value
+        self._sq_array = sq_off.array
+        self._cq_head = ctypes.c_uint32.from_buffer(self._cq_ring, cq_off.head)
+        self._cq_tail = ctypes.c_uint32.from_buffer(self._cq_ring, cq_off.tail)
+        self._cq_mask = ctypes.c_uint32.from_buffer(self._cq_ring, cq_off.ring_mask).value
+        self._cqes = cq_off.cqes
+        self._pending = 0
+        self.fixed_files = 0
+        # buffers that queued SQEs point into (sockaddrs, timespecs, send data); the
+        # caller parks them here until the batch is reaped. Compiled builds drop a
+        # local after its last use, so a local alone does not keep them alive.
+        self.pinned: list = []
+
+    def _map(self, size: int, offset: int) -> mmap.mmap:
+        m = mmap.mmap(self.fd, size, mmap.MAP_SHARED, mmap.PROT_READ | mmap.PROT_WRITE, offset=offset)
+        self._maps.append(m)
+        return m
+
+    def _register(self, opcode: int, arg, nr_args: int) -> int:
+        ret = self._libc.syscall(ctypes.c_long(_NR_IO_URING_REGISTER), ctypes.c_long(self.fd),
+                                 ctypes.c_long(opcode), arg, ctypes.c_long(nr_args))
+        if ret < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, f"io_uring_register: {os.strerror(err)}")
+        return ret
+
+    def supports(self, opcode: int) -> bool:
+        """Ask the kernel (IORING_REGISTER_PROBE, 5.6+) whether it implements opcode."""
+        # struct io_uring_probe: 16-byte header, then 8 bytes per op
+        probe = ctypes.create_string_buffer(16 + 256 * 8)
+        try:
+            self._register(_IORING_REGISTER_PROBE, probe, 256)
+        except OSError:
+            return False
+        last_op = probe.raw[0]
+        if opcode > last_op:
+            return False
+        op, _, flags = struct.unpack_from('<BBH', probe, 16 + opcode * 8)
+        return op == opcode and bool(flags & _IO_URING_OP_SUPPORTED)
+
+    def register_files(self, count: int) -> None:
+        """Register a sparse table of `count` fixed-file slots for direct descriptors."""
+        slots = (ctypes.c_int32 * count)(*([-1] * count))
+        self._register(_IORING_REGISTER_FILES, slots, count)
+        self.fixed_files = count
+
+    def prep(self, opcode: int, fd: int, addr: int = 0, length: int = 0, off: int = 0,
+             user_data: int = 0, sqe_flags: int = 0, file_index: int = 0) -> None:
+        """Queue one SQE. Caller must not queue more than sq_entries before submitting."""
+        tail = self._sq_tail.value + self._pending
+        idx = tail & self._sq_mask
+        _SQE.pack_into(self._sqes, idx * _SQE.size,
+                       opcode, sqe_flags, 0, fd, off, addr, length, 0, user_data, 0, 0, file_index, 0, 0)
+        struct.pack_into('<I', self._sq_ring, self._sq_array + idx * 4, idx)
+        self._pending += 1
+
+    def submit_and_wait(self, wait_nr: int) -> None:
+        """Publish queued SQEs and block until at least wait_nr CQEs are available."""
+        to_submit = self._pending
+        self._sq_tail.value = (self._sq_tail.value + to_submit) & 0xFFFFFFFF
+        self._pending = 0
+        while True:
+            ret = self._libc.syscall(ctypes.c_long(_NR_IO_URING_ENTER), ctypes.c_long(self.fd),
+                                     ctypes.c_long(to_submit), ctypes.c_long(wait_nr),
+                                     ctypes.c_long(_IORING_ENTER_GETEVENTS), None, ctypes.c_long(0))
+            if ret >= 0:
+                return
+            err = ctypes.get_errno()
+            if err != errno.EINTR:
+                raise OSError(err, f"io_uring_enter: {os.strerror(err)}")
+            # the SQEs were consumed before the interrupt; only wait again
+            to_submit = 0
+
+    def reap(self):
+        """Yield (user_data, res) for every CQE currently in the completion ring."""
+        head = self._cq_head.value
+        tail = self._cq_tail.value
+        while head != tail:
+            user_data, res, _ = _CQE.unpack_from(self._cq_ring, self._cqes + (head & self._cq_mask) * _CQE.size)
+            head = (head + 1) & 0xFFFFFFFF
+            yield user_data, res
+        self._cq_head.value = head
+
+    def close(self) -> None:
+        # ctypes views pin the mmap buffers, swap in unbacked ones before unmapping
+        self._sq_tail, self._cq_head, self._cq_tail = ctypes.c_uint32(), ctypes.c_uint32(), ctypes.c_uint32()
+        for m in self._maps:
+            m.close()
+        self._maps = []
+        if getattr(self, 'fd', -1) >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+def _ring_entries(n: int) -> int:
+    """io_uring wants a power of two between 1 and 32768."""
+    entries = 1
+    while entries < n and entries < 32768:
+        entries <<= 1
+    return entries
+
+
+def _pack_sockaddr(family: int, addr: str, port: int) -> bytes:
+    """Build a raw struct sockaddr_in / sockaddr_in6 for (addr, port)."""
+    if family == socket.AF_INET:
+        return struct.pack('=H', family) + struct.pack('!H', port) + socket.inet_pton(family, addr) + bytes(8)
+    return struct.pack('=H', family) + struct.pack('!HI', port, 0) + socket.inet_pton(family, addr) + bytes(4)
+
+def _services_path() -> str:
+    if os.name == 'nt':
+        return os.path.join(os.environ.get('SystemRoot', r'C:\Windows'), 'System32', 'drivers', 'etc', 'services')
+    return '/etc/services'
+
+
+@functools.lru_cache(maxsize=None)
+def _services() -> dict:
+    """
+    {(port, proto): name} parsed once from the services file, so a lookup is a dict
+    hit instead of libc re-reading the database. The first entry for a port wins,
+    as with getservbyport. Empty when the file cannot be read.
+    """
+    table: dict = {}
+    try:
+        with open(_services_path(), encoding='utf-8', errors='replace') as fh:
+            for line in fh:
+                fields = line.split('#', 1)[0].split()
+                if len(fields) < 2:
+                    continue
+                port, _, proto = fields[1].partition('/')
+                if port.isdigit() and proto:
+                    table.setdefault((int(port), proto.lower()), fields[0])
+    except OSError:
+        pass
+    return table
+
+
+@functools.lru_cache(maxsize=8192)
+def _getservbyport(port: int, proto: str) -> str:
+    try:
+        return socket.getservbyport(port, proto)
+    except Exception:
+        return "unknown"
+
+
+def _servname(port: int, proto: str = 'tcp') -> str:
+    """Service name for port from the services file, or getservbyport where there is none."""
+    table = _services()
+    if table:
+        return table.get((port, proto), "unknown")
+    return _getservbyport(port, proto)
+
+
+def _recv_banner(sock: socket.socket) -> bytes:
+    """One read of up to 4 KiB straight into a scratch buffer; b'' on EOF."""
+    buf = bytearray(4096)
+    n = sock.recv_into(buf)
+    return bytes(memoryview(buf)[:n])
+
+
+@functools.lru_cache(maxsize=None)
+def _tls_context() -> ssl.SSLContext:
+    """
+    One client context shared by every TLS banner probe. Certificates are not verified:
+    the probe only wants the service's response, and skipping verification also means
+    the system CA bundle is never loaded and parsed.
+    """
+    ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    ctx.check_hostname = False
+    ctx.verify_mode = ssl.CERT_NONE
+    return ctx
+
+
+@functools.lru_cache(maxsize=1024)
+def _resolve(host: str) -> Tuple[Tuple[int, str], ...]:
+    """
+    Resolve host to every distinct (family, textual address) pair, in resolver order,
+    memoized per hostname so repeated targets hit the resolver once. Literal IPs are
+    parsed directly and never reach getaddrinfo. Returns an empty tuple when the name
+    has no usable address; resolver errors (socket.gaierror) propagate and are not cached.
+    """
+    # If it's a literal IP, ipaddress will parse it
+    try:
+        ip_obj = ipaddress.ip_address(host)
+        return ((socket.AF_INET6 if ip_obj.version == 6 else socket.AF_INET, str(ip_obj)),)
+    except ValueError:
+        pass
+    # getaddrinfo(target, None) returns tuples including (family, ..., sockaddr)
+    found: List[Tuple[int, str]] = []
+    for fam, _, _, _, sockaddr in socket.getaddrinfo(host, None, type=socket.SOCK_STREAM):
+        # sockaddr is like ('1.2.3.4', 0) or ('::1', 0, flow, scope)
+        entry = (int(fam), str(sockaddr[0]))
+        if fam in (socket.AF_INET, socket.AF_INET6) and entry not in found:
+            found.append(entry)
+    return tuple(found)
+
+
+def _sockaddr_for(family: int, addr: str, port: int) -> tuple:
+    """Socket address for (addr, port) in the shape family expects."""
+    if family == socket.AF_INET:
+        return (addr, port)
+    return (addr, port, 0, 0)
+
+
+# connect_ex() results meaning "non-blocking connect started"
+_CONNECT_PENDING = frozenset({0, errno.EINPROGRESS, errno.EWOULDBLOCK, getattr(errno, 'WSAEWOULDBLOCK', 10035)})
+
+_SOCK_NONBLOCK = getattr(socket, 'SOCK_NONBLOCK', 0)
+
+
+def _nonblocking_socket(family: int) -> socket.socket:
+    """
+    A TCP socket that is non-blocking from the start. On Linux SOCK_NONBLOCK goes into
+    the socket() call itself (Python already adds SOCK_CLOEXEC there), so no separate
+    ioctl flips the mode; elsewhere setblocking(False) does it.
+
+    Buffers are pinned at PROBE_SOCKET_BUFFER before connect, so the SYN advertises a
+    small window and the kernel never autotunes a probe up to tcp_rmem's maximum, and
+    TCP_NODELAY sends a banner probe's request without waiting on Nagle.
+    """
+    sock = socket.socket(family, socket.SOCK_STREAM | _SOCK_NONBLOCK)
+    if not _SOCK_NONBLOCK:
+        sock.setblocking(False)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, PROBE_SOCKET_BUFFER)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, PROBE_SOCKET_BUFFER)
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return sock
+
+
+# struct linger {l_onoff = 1, l_linger = 0}; Winsock declares both fields u_short
+_LINGER_RESET = struct.pack('HH' if os.name == 'nt' else 'ii', 1, 0)
+
+
+def _reset_on_close(sock: socket.socket) -> None:
+    """
+    Make close() abort a connected probe with RST instead of FIN. That is deliberate
+    for a scanner: the normal close would park every open port found in TIME_WAIT for
+    a minute, holding kernel memory and an ephemeral port each.
+    """
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, _LINGER_RESET)
+    except OSError:
+        pass
+
+
+def _wait_writable(sock: socket.socket, timeout: float) -> bool:
+    """poll() for POLLOUT (select() where poll is missing); False on timeout."""
+    if hasattr(select, 'poll'):
+        p = select.poll()
+        p.register(sock, select.POLLOUT)
+        return bool(p.poll(max(0, int(timeout * 1000))))
+    _, writable, _ = select.select([], [sock], [sock], timeout)
+    return bool(writable)
+
+
+# select() watches at most FD_SETSIZE sockets (512 on Windows), so a select-backed
+# poller keeps its window a little below that
+_SELECT_MAX_SOCKETS = 500
+
+
+def _select_capped(window: int) -> int:
+    """window, lowered to _SELECT_MAX_SOCKETS where selectors can only fall back to select()."""
+    if selectors.DefaultSelector is selectors.SelectSelector:
+        return min(window, _SELECT_MAX_SOCKETS)
+    return window
+
+
+class _ConnectPoller:
+    """
+    Waits on pending non-blocking connects for scan_range_epoll. On Linux it is a raw
+    epoll, whose event mask already says how each connect ended (EPOLLERR/EPOLLHUP
+    means it failed), so no SO_ERROR getsockopt is made per port, and closing a socket
+    drops it from the set without an EPOLL_CTL_DEL. Elsewhere it is a
+    selectors.DefaultSelector followed by SO_ERROR.
+    """
+
+    _EPOLL_FAILED = getattr(select, 'EPOLLERR', 0) | getattr(select, 'EPOLLHUP', 0)
+
+    def __init__(self, size: int):
+        self._epoll = select.epoll(size) if hasattr(select, 'epoll') else None
+        self._sel = None if self._epoll is not None else selectors.DefaultSelector()
+
+    def register(self, sock: socket.socket) -> None:
+        if self._epoll is not None:
+            self._epoll.register(sock.fileno(), select.EPOLLOUT)
+        elif self._sel is not None:
+            self._sel.register(sock, selectors.EVENT_WRITE)
+
+    def forget(self, sock: socket.socket) -> None:
+        """Call before closing a registered socket (a no-op for epoll)."""
+        if self._sel is not None:
+            self._sel.unregister(sock)
+
+    def ready(self, timeout: float) -> List[Tuple[int, int]]:
+        """(fd, failed) for every connect that finished; failed is 0 for an open port."""
+        if self._epoll is not None:
+            failed = self._EPOLL_FAILED
+            return [(fd, mask & failed) for fd, mask in self._epoll.poll(timeout)]
+        if self._sel is None:
+            return []
+        return [(key.fd, key.fileobj.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR))  # type: ignore
+                for key, _ in self._sel.select(timeout)]
+
+    def close(self) -> None:
+        if self._epoll is not None:
+            self._epoll.close()
+        if self._sel is not None:
+            self._sel.close()
+
+
+def _connect_probe(family: int, sockaddr: tuple, timeout: float,
+                   _socket=_nonblocking_socket, _pending=_CONNECT_PENDING, _wait=_wait_writable,
+                   _reset=_reset_on_close, _SOL_SOCKET=socket.SOL_SOCKET,
+                   _SO_ERROR=socket.SO_ERROR) -> bool:
+    """
+    One TCP connect probe; True if sockaddr accepted within timeout. socket(SOCK_NONBLOCK)
+    + connect + poll + SO_ERROR are the syscalls a timed connect_ex makes internally,
+    minus settimeout's ioctl. Runs once per port, so every global it touches is bound
+    as a default argument and read as a local.
+    """
+    sock = _socket(family)
+    try:
+        result = sock.connect_ex(sockaddr)
+        if result in _pending:
+            if not _wait(sock, timeout):
+                return False
+            result = sock.getsockopt(_SOL_SOCKET, _SO_ERROR)
+        if result:
+            return False
+        _reset(sock)
+        return True
+    finally:
+        sock.close()
+
+
+def _write_stdout(data: bytes) -> None:
+    """
+    Write already-encoded scan output to stdout's binary buffer, behind whatever
+    print() left in the text layer, so no str is built or re-encoded on the way.
+    A redirected stdout without one (io.StringIO in worker processes) gets text.
+    """
+    out = sys.stdout
+    raw = getattr(out, 'buffer', None)
+    if raw is None:
+        out.write(data.decode('utf-8', 'replace'))
+        return
+    out.flush()
+    raw.write(data)
+
+
+def _consume(
+    results: _ResultQueue,
+    total: int,
+    on_open: Callable[[int], None],
+    on_closed: Callable[[int], None],
+    on_error: Callable[[int, BaseException], None],
+    scanner: 'PortScanner'
+) -> None:
+    """
+    Drain `total` (port, outcome) pairs from the scan workers' result queue and hand
+    each port to its callback, keeping scanner._scanned current for the progress
+    ticker. outcome is what scan_port returned, or the exception it raised. Kept as a
+    typed free function so it compiles cleanly under mypyc along with scan_port
+    (see docs/INSTALL.md).
+    """
+    for scanned in range(1, total + 1):
+        port, outcome = results.get()
+        if isinstance(outcome, BaseException):
+            on_error(port, outcome)
+        elif outcome:
+            on_open(port)
+        else:
+            on_closed(port)
+        scanner._scanned = scanned
+
+
 class PortScanner:
-    def __init__(self, target: str, timeout: float = 1.0, threads: int = 100):
+    def __init__(self, target: str, timeout: float = 1.0, threads: int = 100, show_progress: bool = True):
         """
         target: a hostname or IP string (IPv4/IPv6)
+        show_progress: print a progress line every PROGRESS_INTERVAL seconds during range scans
         """
         self.target = target
         self.timeout = timeout
         self.threads = threads
-        self.open_ports: List[int] = []
+        self.show_progress = show_progress
+        # HEAD probe sent to HTTP-like ports; the Host: line never changes for a target,
+        # and Connection: close makes the server hang up right after answering
+        self._http_head_req = f"HEAD / HTTP/1.0\r\nHost: {target}\r\nConnection: close\r\n\r\n".encode('utf-8')
+        # per-port output is batched, already encoded, and written out on progress ticks,
+        # not line by line; an int entry is an open port whose line (and service name)
+        # is made on flush
+        self._out_buf: List[Union[bytes, int]] = []
+        self._out_lock = threading.Lock()
+        # ports finished so far in the running range scan, read by the progress ticker
+        self._scanned = 0
+        # kept in port order as ports are found (bisect.insort), never re-sorted; packed
+        # as unsigned 16-bit values, 2 bytes a port instead of a list of int objects
+        self.open_ports: 'array.array[int]' = array.array('H')
         self.banners: dict = {}
         self.detected_services: dict = {}
         self.addr: Optional[str] = None    # textual IP address we will connect to
         self.family: Optional[int] = None  # socket.AF_INET or AF_INET6
+        # every resolved (family, addr); addr/family above are the first of them
+        self.addrs: List[Tuple[int, str]] = []
+        # first address per family, worked out once per target rather than per port;
+        # more than one entry means scan_port races the families
+        self._candidates: List[Tuple[int, str]] = []
+        # (family, addr) that won the connect race for a port on dual-stack targets
+        self._port_addr: dict = {}
+        # ASCII-lowercased raw banner per port, for detect_service_from_banner
+        self._banner_lower: dict = {}
+        # latest TLS session per address, offered for resumption by grab_banner
+        self._tls_sessions: dict = {}
+
+    @classmethod
+    def from_resolved(cls, target: str, family: int, addr: str, **kwargs) -> 'PortScanner':
+        """
+        Scanner for a target whose address is already known (a CIDR host, a SYN-scan
+        result), so resolve_target() and its parsing are skipped. kwargs go to __init__.
+        """
+        scanner = cls(target, **kwargs)
+        scanner._set_addrs([(family, addr)])
+        return scanner
 
     def resolve_target(self) -> bool:
         """
         Resolve the provided target into an IP address and detect address family.
         - If target is a literal IP, set family directly.
-        - Otherwise, perform DNS resolution (getaddrinfo) and pick the first usable result.
+        - Otherwise, perform DNS resolution (getaddrinfo) and keep every usable result;
+          the first one becomes self.addr/self.family.
         Returns True on success, False on failure.
         """
-        # If it's a literal IP, ipaddress will parse it
         try:
-            ip_obj = ipaddress.ip_address(self.target)
-            self.addr = str(ip_obj)
-            self.family = socket.AF_INET6 if ip_obj.version == 6 else socket.AF_INET
-            return True
-        except ValueError:
-            # Not a literal IP; attempt DNS resolution
-            try:
-                # getaddrinfo(target, None) returns tuples including (family, ..., sockaddr)
-                infos = socket.getaddrinfo(self.target, None, type=socket.SOCK_STREAM)
-                # prefer AF_INET first, but accept AF_INET6 as well
-                chosen = None
-                for info in infos:
-                    fam, _, _, _, sockaddr = info
-                    if fam in (socket.AF_INET, socket.AF_INET6):
-                        chosen = info
-                        break
-                if not chosen:
-                    print(f"[!] Error: No IPv4/IPv6 address found for {self.target}")
-                    return False
-                fam, _, _, _, sockaddr = chosen
-                # sockaddr is like ('1.2.3.4', 0) or ('::1', 0, flow, scope)
-                self.family = fam
-                self.addr = sockaddr[0]
-                return True
-            except socket.gaierror:
-                print(f"[!] Error: Could not resolve hostname {self.target}")
-                return False
-            except Exception as e:
-                print(f"[!] Unexpected error resolving {self.target}: {e}")
-                return False
+            resolved = _resolve(self.target)
+        except socket.gaierror:
+            print(f"[!] Error: Could not resolve hostname {self.target}")
+            return False
+        except Exception as e:
+            print(f"[!] Unexpected error resolving {self.target}: {e}")
+            return False
+        if not resolved:
+            print(f"[!] Error: No IPv4/IPv6 address found for {self.target}")
+            return False
+        self._set_addrs(list(resolved))
+        return True
+
+    def _set_addrs(self, addrs: List[Tuple[int, str]]) -> None:
+        """Adopt a resolution result; the first (family, addr) is the one scanned."""
+        self.addrs = addrs
+        self.family, self.addr = addrs[0]
+        self._candidates = self._race_candidates()
+
+    def _endpoint(self) -> Tuple[int, str]:
+        """(family, addr) of the resolved target; the engines only run after resolve_target()."""
+        if self.family is None or self.addr is None:
+            raise OSError(errno.EDESTADDRREQ, f"{self.target} is not resolved")
+        return self.family, self.addr
+
+    def _sockaddr(self, port: int) -> tuple:
+        """Socket address for (self.addr, port) in the shape self.family expects."""
+        return _sockaddr_for(*self._endpoint(), port)
+
+    def _race_candidates(self) -> List[Tuple[int, str]]:
+        """First address of each family; more than one means connects are raced."""
+        firsts: dict = {}
+        for fam, addr in self.addrs:
+            firsts.setdefault(fam, addr)
+        return list(firsts.items())
+
+    def _race_connect(self, port: int, candidates: List[Tuple[int, str]]) -> Optional[Tuple[int, str]]:
+        """
+        Happy-Eyeballs style connect: start a non-blocking connect to every candidate
+        at once and return the (family, addr) of the first one that succeeds, so a
+        firewalled family costs nothing while the other answers. None if all fail.
+        """
+        sel = selectors.DefaultSelector()
+        socks = []
+        try:
+            for fam, addr in candidates:
+                sock = _nonblocking_socket(fam)
+                socks.append(sock)
+                if sock.connect_ex(_sockaddr_for(fam, addr, port)) in _CONNECT_PENDING:
+                    sel.register(sock, selectors.EVENT_WRITE, (sock, (fam, addr)))
+            deadline = time.monotonic() + self.timeout
+            while sel.get_map():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                for key, _ in sel.select(remaining):
+                    sock, winner = key.data
+                    sel.unregister(sock)
+                    if sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) == 0:
+                        _reset_on_close(sock)
+                        return winner
+            return None
+        finally:
+            # closing the losers also cancels their pending connects
+            for sock in socks:
+                sock.close()
+            sel.close()
 
     def scan_port(self, port: int) -> Optional[int]:
         """
-        Attempt to connect to (self.addr, port) using the detected family.
+        Attempt to connect to (self.addr, port) using the detected family. When the
+        target resolved to both IPv4 and IPv6 the two families are raced instead.
         Returns port if open, None otherwise.
         """
         if not self.addr or not self.family:
             return None
         try:
-            sock = socket.socket(self.family, socket.SOCK_STREAM)
-            sock.settimeout(self.timeout)
-            if self.family == socket.AF_INET:
-                sockaddr = (self.addr, port)
-            else:
-                sockaddr = (self.addr, port, 0, 0)
-            result = sock.connect_ex(sockaddr)
-            sock.close()
-            if result == 0:
+            candidates = self._candidates
+            if len(candidates) > 1:
+                winner = self._race_connect(port, candidates)
+                if winner is None:
+                    return None
+                self._port_addr[port] = winner
+                return port
+            if _connect_probe(self.family, self._sockaddr(port), self.timeout):
                 return port
             return None
         except Exception:
             return None
 
     def get_service_name(self, port: int, proto: str = 'tcp') -> str:
-        try:
-            return socket.getservbyport(port, proto)
-        except Exception:
-            return "unknown"
+        return _servname(port, proto)
 
     def grab_banner(self, port: int, banner_timeout: float = 2.0) -> Optional[str]:
         """
@@ -124,16 +760,11 @@ class PortScanner:
         if not self.addr or not self.family:
             return None
         try:
-            sock = socket.socket(self.family, socket.SOCK_STREAM)
+            # reuse whichever family won the connect race for this port
+            family, addr = self._port_addr.get(port, (self.family, self.addr))
+            sock = socket.socket(family, socket.SOCK_STREAM)
             sock.settimeout(min(self.timeout, banner_timeout))
-            if self.family == socket.AF_INET:
-                sockaddr = (self.addr, port)
-            else:
-                sockaddr = (self.addr, port, 0, 0)
-
-            # For ports that commonly use TLS (HTTPS), attempt to wrap in SSL
-            tls_ports = {443, 8443, 9443}
-            http_ports = {80, 8080, 8000, 81, 8888, 8008}
+            sockaddr = _sockaddr_for(family, addr, port)
 
             try:
                 sock.connect(sockaddr)
@@ -144,22 +775,27 @@ class PortScanner:
             banner = b''
 
             # If this looks like HTTPS, try TLS handshake and an HTTP HEAD
-            if port in tls_ports:
+            # For ports that commonly use TLS (HTTPS), attempt to wrap in SSL
+            if port in TLS_PORTS:
                 try:
-                    ctx = ssl.create_default_context()
-                    tls_sock = ctx.wrap_socket(sock, server_hostname=self.target)
+                    # offer the last session this address handed out: a resumed
+                    # handshake skips the key exchange and certificate entirely
+                    tls_sock = _tls_context().wrap_socket(sock, server_hostname=self.target,
+                                                          session=self._tls_sessions.get(addr))
                     tls_sock.settimeout(min(self.timeout, banner_timeout))
                     try:
                         # Send a minimal HEAD to get a response
-                        req = f"HEAD / HTTP/1.0\r\nHost: {self.target}\r\n\r\n".encode('utf-8')
-                        tls_sock.sendall(req)
-                        banner = tls_sock.recv(4096) or b''
+                        tls_sock.sendall(self._http_head_req)
+                        banner = _recv_banner(tls_sock)
                     except Exception:
                         # Even if we can't send, attempt to read server response
                         try:
-                            banner = tls_sock.recv(4096) or b''
+                            banner = _recv_banner(tls_sock)
                         except Exception:
                             banner = b''
+                    # TLS 1.3 tickets arrive after the handshake, so read it only now
+                    if tls_sock.session is not None:
+                        self._tls_sessions[addr] = tls_sock.session
                     try:
                         tls_sock.close()
                     except Exception:
@@ -167,7 +803,7 @@ class PortScanner:
                 except Exception:
                     # TLS failed; fall back to plain read
                     try:
-                        banner = sock.recv(4096) or b''
+                        banner = _recv_banner(sock)
                     except Exception:
                         banner = b''
                     try:
@@ -176,14 +812,13 @@ class PortScanner:
                         pass
             else:
                 # Non-TLS: for HTTP-ish ports, send a HEAD to prompt a response
-                if port in http_ports:
+                if port in HTTP_PORTS:
                     try:
-                        req = f"HEAD / HTTP/1.0\r\nHost: {self.target}\r\n\r\n".encode('utf-8')
-                        sock.sendall(req)
+                        sock.sendall(self._http_head_req)
                     except Exception:
                         pass
                 try:
-                    banner = sock.recv(4096) or b''
+                    banner = _recv_banner(sock)
                 except Exception:
                     banner = b''
                 try:
@@ -191,20 +826,24 @@ class PortScanner:
                 except Exception:
                     pass
 
-            if not banner:
-                return None
-            try:
-                text = banner.decode('utf-8', errors='ignore').strip()
-            except Exception:
-                text = str(banner)
-            return text
+            return self._decode_banner(port, banner)
         except Exception:
             return None
 
+    def _decode_banner(self, port: int, raw: Optional[bytes]) -> Optional[str]:
+        """
+        Text form of a raw banner, or None when it is empty. The lowercased bytes are
+        kept as well so keyword matching never lowers or re-encodes the text.
+        """
+        if not raw:
+            return None
+        self._banner_lower[port] = raw.translate(_LOWER_TABLE)
+        return raw.decode('utf-8', errors='ignore').strip() or None
+
     def detect_service_from_banner(self, port: int, banner: Optional[str]) -> str:
         """
         Heuristically detect service name from port and banner contents.
-        Combines getservbyport and keyword matching against banner text.
+        Combines the services-file name and keyword matching against banner text.
         Returns a string describing the likely service.
         """
         # Start with well-known service from port table
@@ -217,113 +856,885 @@ class PortScanner:
         if not banner:
             return base or 'unknown'
 
-        b = banner.lower()
-        # simple keyword checks
-        checks = [
-            ('nginx', 'nginx'),
-            ('apache', 'apache'),
-            ('iis', 'iis'),
-            ('tomcat', 'tomcat'),
-            ('ssh', 'ssh'),
-            ('smtp', 'smtp'),
-            ('esmtp', 'smtp'),
-            ('ftp', 'ftp'),
-            ('mysql', 'mysql'),
-            ('mariadb', 'mysql'),
-            ('postgres', 'postgresql'),
-            ('http', 'http'),
-            ('http/', 'http'),
-            ('ssl', 'ssl'),
-            ('openssl', 'ssl'),
-            ('ssh-', 'ssh'),
-            ('postfix', 'smtp'),
-            ('exim', 'smtp'),
-            ('dovecot', 'imap/pop3'),
-            ('imap', 'imap'),
-            ('pop3', 'pop3'),
-            ('rdp', 'rdp'),
-        ]
-        for key, name in checks:
-            if key in b:
+        # first keyword in BANNER_KEYWORDS order wins
+        lowered = self._banner_lower.get(port)
+        if lowered is None:
+            lowered = banner.encode('utf-8', errors='ignore').translate(_LOWER_TABLE)
+        for key, name in _BANNER_KEYWORD_BYTES:
+            if key in lowered:
                 if base:
                     return f"{base} ({name})"
                 return name
         return base or 'unknown'
 
-    def scan_range(self, start_port: int, end_port: int, verbose: bool = False,
-                   do_banner: bool = False, do_service_detect: bool = False) -> None:
+    def _uring_banner_batch(self, ring: _IoUring, ports, banner_timeout: float) -> dict:
+        """
+        Fetch banners for `ports` with one io_uring submission. Every port gets the chain
+        CONNECT -> [SEND HEAD] -> RECV, each step followed by a LINK_TIMEOUT, so a failed
+        or slow step cancels the rest of its own chain without touching the others.
+        Returns {port: raw bytes}; ports that produced nothing are omitted.
+        """
+        family, dst = self._endpoint()
+        n = len(ports)
+        addr_size = 16 if family == socket.AF_INET else 28
+        addrs = ctypes.create_string_buffer(n * addr_size)
+        # one receive arena for the whole batch instead of a buffer per port
+        bufs = ctypes.create_string_buffer(n * 4096)
+        head = ctypes.create_string_buffer(self._http_head_req)
+        head_len = len(self._http_head_req)
+        t = min(self.timeout, banner_timeout)
+        ts = _KernelTimespec(int(t), int((t % 1) * 1e9))
+        socks = [socket.socket(family, socket.SOCK_STREAM | socket.SOCK_NONBLOCK) for _ in ports]
+        expected = 0
+        ring.pinned = [addrs, head, ts]
+        try:
+            for i, (port, sock) in enumerate(zip(ports, socks)):
+                fd = sock.fileno()
+                struct.pack_into(f'{addr_size}s', addrs, i * addr_size,
+                                 _pack_sockaddr(family, dst, port))
+                steps = [(_IORING_OP_CONNECT, ctypes.addressof(addrs) + i * addr_size, 0, addr_size)]
+                if port in HTTP_PORTS:
+                    steps.append((_IORING_OP_SEND, ctypes.addressof(head), head_len, 0))
+                steps.append((_IORING_OP_RECV, ctypes.addressof(bufs) + i * 4096, 4096, 0))
+                for step, (opcode, addr, length, off) in enumerate(steps):
+                    last = step == len(steps) - 1
+                    ring.prep(opcode, fd, addr=addr, length=length, off=off,
+                              user_data=(i << 4) | (step << 1), sqe_flags=_IOSQE_IO_LINK)
+                    ring.prep(_IORING_OP_LINK_TIMEOUT, -1, addr=ctypes.addressof(ts), length=1,
+                              user_data=(i << 4) | (step << 1) | 1, sqe_flags=0 if last else _IOSQE_IO_LINK)
+                expected += 2 * len(steps)
+            received = {}
+            seen = 0
+            while seen < expected:
+                ring.submit_and_wait(expected - seen)
+                for user_data, res in ring.reap():
+                    seen += 1
+                    i = user_data >> 4
+                    op_step = (user_data >> 1) & 0x7
+                    # only the RECV step (the last one in its chain) carries data
+                    if not user_data & 1 and res > 0 and op_step == (2 if ports[i] in HTTP_PORTS else 1):
+                        received[ports[i]] = bufs.raw[i * 4096:i * 4096 + res]
+            return received
+        finally:
+            for sock in socks:
+                sock.close()
+            ring.pinned = []
+
+    def banner_batch(self, ports, banner_timeout: float = 2.0) -> dict:
+        """
+        Grab banners for many open ports at once. Plain-text ports are collected with
+        batched io_uring submissions where available; TLS ports (and every port when
+        io_uring is unavailable) go through grab_banner one at a time.
+        Returns {port: banner string or None}.
+        """
+        banners = {}
+        # the ring batch talks to self.addr only; ports won by another family stay synchronous
+        primary = (self.family, self.addr)
+        plain = [p for p in ports if p not in TLS_PORTS and self._port_addr.get(p, primary) == primary]
+        batch = max(1, min(self.threads, len(plain), 5000))
+        ring = None
+        if plain and self.addr and self.family:
+            try:
+                ring = _IoUring(_ring_entries(6 * batch))
+            except OSError:
+                ring = None
+        if ring is not None:
+            try:
+                for offset in range(0, len(plain), batch):
+                    chunk = plain[offset:offset + batch]
+                    try:
+                        raw = self._uring_banner_batch(ring, chunk, banner_timeout)
+                    except OSError:
+                        continue
+                    for port in chunk:
+                        banners[port] = self._decode_banner(port, raw.get(port))
+            finally:
+                ring.close()
+        for port in ports:
+            if port not in banners:
+                banners[port] = self.grab_banner(port, banner_timeout)
+        return banners
+
+    def _emit(self, line: str) -> None:
+        """Queue a line of scan output; written out in bulk by _flush_output."""
+        self._emit_bytes((line + '\n').encode('utf-8', 'replace'))
+
+    def _emit_bytes(self, line: bytes) -> None:
+        self._out_buf.append(line)
+        if len(self._out_buf) >= 1024:
+            self._flush_output()
+
+    def _flush_output(self) -> None:
+        # the progress ticker flushes from its own thread; lines the scan appends
+        # meanwhile land past n and wait for the next flush
+        with self._out_lock:
+            buf = self._out_buf
+            n = len(buf)
+            if n:
+                _write_stdout(b''.join([line if isinstance(line, bytes) else self._open_port_line(line)
+                                        for line in buf[:n]]))
+                del buf[:n]
+        sys.stdout.flush()
+
+    def _open_port_line(self, port: int) -> bytes:
+        return b"[+] Port %5d - OPEN (%s)\n" % (port, self.get_service_name(port).encode('utf-8', 'replace'))
+
+    def _progress(self, scanned: int, total_ports: int) -> None:
+        # an empty range (e.g. -p 5-4) has no percentage to show
+        if self.show_progress and total_ports > 0:
+            progress = (scanned / total_ports) * 100
+            self._emit(f"[*] Progress: {progress:.1f}% ({scanned}/{total_ports})")
+        self._flush_output()
+
+    @contextlib.contextmanager
+    def _progress_ticker(self, total_ports: int) -> Iterator[None]:
+        """
+        Report self._scanned every PROGRESS_INTERVAL seconds from a side thread, and
+        once more at the end, so the engines' per-port loops only bump a counter.
+        """
+        self._scanned = 0
+        stop = threading.Event()
+
+        def tick() -> None:
+            while not stop.wait(PROGRESS_INTERVAL):
+                self._progress(self._scanned, total_ports)
+
+        ticker = threading.Thread(target=tick, daemon=True)
+        ticker.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            ticker.join()
+            self._progress(self._scanned, total_ports)
+
+    def _report_open_port(self, port: int) -> None:
+        # only the port is queued: naming the service and formatting the line wait
+        # for _flush_output, off the engines' result loops
+        self._out_buf.append(port)
+        bisect.insort(self.open_ports, port)
+
+    def _report_closed_port(self, port: int) -> None:
+        # the hot line of a verbose scan: formatted straight to bytes
+        self._emit_bytes(b"[-] Port %5d - CLOSED\n" % port)
+
+    def _report_port_error(self, port: int, error: BaseException) -> None:
+        self._emit(f"[!] Port {port:5d} - ERROR: {error}")
+
+    @staticmethod
+    def _ignore_port(port: int, error: Optional[BaseException] = None) -> None:
+        pass
+
+    def _make_port_handlers(self, verbose: bool):
+        """
+        (on_open, on_closed, on_error) callbacks for the engines' result loops, chosen
+        once per scan so the per-port path is a plain call with no verbose check in it.
+        """
+        if verbose:
+            return self._report_open_port, self._report_closed_port, self._report_port_error
+        return self._report_open_port, self._ignore_port, self._ignore_port
+
+    def _collect_banners(self, do_banner: bool, do_service_detect: bool, grabbed: Optional[dict] = None) -> None:
+        """
+        Run the optional banner/service-detection steps over every open port found.
+        `grabbed` holds banners an engine already read during the scan; only the
+        remaining ports are probed again.
+        """
+        self._flush_output()
+        ports = self.open_ports
+        if do_banner and ports:
+            print(f"\n[*] Grabbing banners from {len(ports)} open ports")
+            banners = dict(grabbed or {})
+            missing = [p for p in ports if p not in banners]
+            if missing:
+                banners.update(self.banner_batch(missing))
+            for port, banner in sorted(banners.items()):
+                self.banners[port] = banner
+                if banner:
+                    print(f"    Port {port:5d} banner: {banner.splitlines()[0]}")
+        if do_service_detect:
+            for port in ports:
+                self.detected_services[port] = self.detect_service_from_banner(port, self.banners.get(port))
+
+    def _scan_worker(self, ports: Iterator[int], lock: threading.Lock, results: _ResultQueue,
+                     stop: threading.Event) -> None:
+        """
+        Thread body for scan_range: take the next port off the shared iterator, probe
+        it and queue (port, outcome) for the main thread, until the range runs dry.
+        Memory stays O(threads): no per-port Future and no dict over the whole range.
+        """
+        probe: Callable[[int], Optional[int]] = self.scan_port
+        if len(self._candidates) == 1:
+            # one family, so no race: bind the target once and probe directly,
+            # with everything the per-port call needs held as default arguments
+            family, addr = self._endpoint()
+            tail = () if family == socket.AF_INET else (0, 0)
+
+            def direct(port: int, family: int = family, addr: str = addr, tail: tuple = tail,
+                       timeout: float = self.timeout, connect=_connect_probe) -> Optional[int]:
+                return port if connect(family, (addr, port) + tail, timeout) else None
+
+            probe = direct
+
+        put = results.put
+        stopped = stop.is_set
+        while not stopped():
+            with lock:
+                port = next(ports, None)
+            if port is None:
+                return
+            try:
+                put((port, probe(port)))
+            except Exception as e:
+                put((port, e))
+
+    def _scan_ports(self, ports: Sequence[int], verbose: bool = False) -> None:
+        """
+        Scan every port in `ports` on min(self.threads, len(ports)) worker threads (at
+        least one) and report each result as it comes in. Shared by scan_range, the
+        common-port scan and explicit port lists, so none of them probes one port at a time.
+        """
+        on_open, on_closed, on_error = self._make_port_handlers(verbose)
+        total_ports = len(ports)
+        if not total_ports:
+            return
+        pending = iter(ports)
+        lock = threading.Lock()
+        results: _ResultQueue = _SimpleQueue()
+        stop = threading.Event()
+        workers = [threading.Thread(target=self._scan_worker, args=(pending, lock, results, stop), daemon=True)
+                   for _ in range(max(1, min(self.threads, total_ports)))]
+        for worker in workers:
+            worker.start()
+        try:
+            with self._progress_ticker(total_ports):
+                _consume(results, total_ports, on_open, on_closed, on_error, self)
+        finally:
+            # on Ctrl+C the workers finish the connect they are in and exit
+            stop.set()
+            for worker in workers:
+                worker.join()
+
+    def _print_scan_header(self, start_port: int, end_port: int, label: str) -> None:
+        """Start banner shared by the scan_range* engines; label says how the range is scanned."""
         print(f"\n[*] Starting scan on {self.target} ({self.addr})")
-        print(f"[*] Scanning ports {start_port}-{end_port} using {self.threads} threads")
+        print(f"[*] Scanning ports {start_port}-{end_port} using {label}")
         print(f"[*] Scan started at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
 
+    def _print_scan_summary(self) -> None:
+        """Closing lines shared by the scan_range* engines, once banners are collected."""
+        print(f"\n[*] Scan completed at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"[*] Found {len(self.open_ports)} open ports")
+        if self.open_ports:
+            print(f"\n[*] Open ports: {', '.join(map(str, self.open_ports))}")
+
+    def scan_range(self, start_port: int, end_port: int, verbose: bool = False,
+                   do_banner: bool = False, do_service_detect: bool = False) -> None:
+        self._print_scan_header(start_port, end_port, f"{self.threads} threads")
+
+        self._scan_ports(range(start_port, end_port + 1), verbose)
+        self._collect_banners(do_banner, do_service_detect)
+
+        self._print_scan_summary()
+
+    def _uring_connect_batch(self, ring: _IoUring, ports) -> List[Tuple[int, int]]:
+        """
+        Connect to every port in `ports` through one io_uring submission.
+        Each CONNECT is linked to a LINK_TIMEOUT carrying self.timeout, so a single
+        io_uring_enter both submits the batch and waits for all of it.
+        Returns a list of (port, res) where res is 0 (open) or a negative errno.
+
+        An fd cannot be recycled once it has connect()ed to some endpoint, so instead
+        of pooling sockets the ring creates them itself when it has fixed-file slots:
+        SOCKET -> CONNECT -> LINK_TIMEOUT, with the socket installed straight into
+        slot i. Installing into an occupied slot drops the previous batch's socket,
+        so no socket()/close() syscalls are made per port at all.
+        """
+        family, dst = self._endpoint()
+        invalid = [(port, -errno.EINVAL) for port in ports if not 0 <= port <= 0xFFFF]
+        if invalid:
+            # a range running past 65535 has no sockaddr to pack; those ports are closed
+            return self._uring_connect_batch(ring, [p for p in ports if 0 <= p <= 0xFFFF]) + invalid
+        n = len(ports)
+        addr_size = 16 if family == socket.AF_INET else 28
+        addrs = ctypes.create_string_buffer(n * addr_size)
+        ts = _KernelTimespec(int(self.timeout), int((self.timeout % 1) * 1e9))
+        direct = ring.fixed_files >= n
+        socks = []
+        ring.pinned = [addrs, ts]
+        try:
+            if not direct:
+                # create every socket before queueing anything so a failure (e.g. EMFILE)
+                # never leaves half a batch sitting unsubmitted in the ring
+                for _ in ports:
+                    socks.append(socket.socket(family, socket.SOCK_STREAM | socket.SOCK_NONBLOCK))
+            for i, port in enumerate(ports):
+                struct.pack_into(f'{addr_size}s', addrs, i * addr_size,
+                                 _pack_sockaddr(family, dst, port))
+                if direct:
+                    ring.prep(_IORING_OP_SOCKET, family, off=socket.SOCK_STREAM | socket.SOCK_NONBLOCK,
+                              user_data=(i << 2) | 2, sqe_flags=_IOSQE_IO_LINK, file_index=i + 1)
+                    ring.prep(_IORING_OP_CONNECT, i, addr=ctypes.addressof(addrs) + i * addr_size,
+                              off=addr_size, user_data=i << 2, sqe_flags=_IOSQE_IO_LINK | _IOSQE_FIXED_FILE)
+                else:
+                    ring.prep(_IORING_OP_CONNECT, socks[i].fileno(), addr=ctypes.addressof(addrs) + i * addr_size,
+                              off=addr_size, user_data=i << 2, sqe_flags=_IOSQE_IO_LINK)
+                ring.prep(_IORING_OP_LINK_TIMEOUT, -1, addr=ctypes.addressof(ts), length=1,
+                          user_data=(i << 2) | 1)
+            results = {}
+            expected = (3 if direct else 2) * n
+            seen = 0
+            while seen < expected:
+                ring.submit_and_wait(expected - seen)
+                for user_data, res in ring.reap():
+                    seen += 1
+                    if not user_data & 3:
+                        results[user_data >> 2] = res
+            return [(port, results.get(i, -errno.ETIMEDOUT)) for i, port in enumerate(ports)]
+        finally:
+            for sock in socks:
+                sock.close()
+            ring.pinned = []
+
+    def scan_range_uring(self, start_port: int, end_port: int, verbose: bool = False,
+                         do_banner: bool = False, do_service_detect: bool = False) -> None:
+        """
+        Same contract as scan_range, but connects are batched through io_uring:
+        _async_concurrency() ports (1000 by default) per io_uring_enter instead of one
+        blocking connect per worker. A batch holds no threads, so like the other
+        event-driven engines it is not limited to --threads ports at a time.
+        Falls back to the thread pool if io_uring cannot be set up.
+        """
+        want = min(self._async_concurrency(), end_port - start_port + 1)
+        try:
+            ring = _IoUring(_ring_entries(3 * want),
+                            _IORING_SETUP_SINGLE_ISSUER | _IORING_SETUP_DEFER_TASKRUN)
+        except OSError as e:
+            print(f"[!] io_uring unavailable ({e}), falling back to thread pool")
+            return self.scan_range(start_port, end_port, verbose=verbose,
+                                   do_banner=do_banner, do_service_detect=do_service_detect)
+
+        try:
+            batch = max(1, min(want, ring.sq_entries // 3))
+            if ring.supports(_IORING_OP_SOCKET):
+                try:
+                    ring.register_files(batch)
+                except OSError:
+                    pass  # keep using regular sockets
+            self._scan_batched(start_port, end_port, batch, lambda chunk: self._uring_connect_batch(ring, chunk),
+                               f"io_uring (batch {batch})", verbose, do_banner, do_service_detect)
+        finally:
+            ring.close()
+
+    def scan_range_epoll(self, start_port: int, end_port: int, verbose: bool = False,
+                         do_banner: bool = False, do_service_detect: bool = False) -> None:
+        """
+        Same contract as scan_range, but runs on a single thread with one poller
+        (raw epoll on Linux, see _ConnectPoller): a sliding window of
+        _async_concurrency() non-blocking connects stays in flight, topped up from
+        the range as each one reports or ages out past self.timeout. Where the poller
+        is plain select(), the window stays under its FD_SETSIZE limit.
+        """
         total_ports = end_port - start_port + 1
-        scanned = 0
+        window = max(1, min(_select_capped(self._async_concurrency()), total_ports))
+        self._print_scan_header(start_port, end_port, f"epoll ({window} in flight)")
+
+        family, _ = self._endpoint()
+        ports = iter(range(start_port, end_port + 1))
+        on_open, on_closed, on_error = self._make_port_handlers(verbose)
+        # fd -> (port, sock, deadline); every deadline is now + self.timeout, so
+        # insertion order is also expiry order and the head is the next to expire
+        inflight: dict = {}
 
-        with ThreadPoolExecutor(max_workers=self.threads) as executor:
-            future_to_port = {
-                executor.submit(self.scan_port, port): port
-                for port in range(start_port, end_port + 1)
-            }
+        def done(port: int, err: int) -> None:
+            (on_closed if err else on_open)(port)
+            self._scanned += 1
 
-            for future in as_completed(future_to_port):
-                port = future_to_port[future]
-                scanned += 1
+        poller = _ConnectPoller(window)
+        try:
+            with self._progress_ticker(total_ports):
+                while True:
+                    now = time.monotonic()
+                    while len(inflight) < window:
+                        port = next(ports, None)
+                        if port is None:
+                            break
+                        try:
+                            sock = _nonblocking_socket(family)
+                        except OSError as e:
+                            on_error(port, e)
+                            self._scanned += 1
+                            continue
+                        try:
+                            err = sock.connect_ex(self._sockaddr(port))
+                        except OverflowError as e:
+                            # a range running past 65535: report the port, keep scanning
+                            sock.close()
+                            on_error(port, e)
+                            self._scanned += 1
+                            continue
+                        if err in _CONNECT_PENDING:
+                            poller.register(sock)
+                            inflight[sock.fileno()] = (port, sock, now + self.timeout)
+                        else:
+                            sock.close()
+                            done(port, err)
+                    if not inflight:
+                        break
+
+                    _, _, head = next(iter(inflight.values()))
+                    for fd, failed in poller.ready(max(0.0, head - time.monotonic())):
+                        port, sock, _ = inflight.pop(fd)
+                        poller.forget(sock)
+                        if not failed:
+                            _reset_on_close(sock)
+                        sock.close()
+                        done(port, failed)
+
+                    now = time.monotonic()
+                    while inflight:
+                        fd = next(iter(inflight))
+                        port, sock, deadline = inflight[fd]
+                        if deadline > now:
+                            break
+                        del inflight[fd]
+                        poller.forget(sock)
+                        sock.close()
+                        done(port, errno.ETIMEDOUT)
+        finally:
+            for _, sock, _ in inflight.values():
+                sock.close()
+            poller.close()
+
+        self._collect_banners(do_banner, do_service_detect)
+
+        self._print_scan_summary()
+
+    async def _tls_banner_async(self, port: int, banner_timeout: float) -> Optional[bytes]:
+        """TLS handshake plus HEAD on a fresh connection, the asyncio twin of grab_banner's TLS branch."""
+        t = min(self.timeout, banner_timeout)
+        family, addr = self._port_addr.get(port, (self.family, self.addr))
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(addr, port, family=family,
+                                        ssl=_tls_context(), server_hostname=self.target), t)
+        except Exception:
+            return None
+        try:
+            writer.write(self._http_head_req)
+            return await asyncio.wait_for(reader.read(4096), t)
+        except Exception:
+            return None
+        finally:
+            writer.close()
+
+    async def _race_connect_async(self, port: int) -> Optional[socket.socket]:
+        """
+        _race_connect on the event loop: connect to every candidate at once and return
+        the first socket that connects (recording its family in _port_addr), or None.
+        The other attempts are cancelled and their sockets closed.
+        """
+        loop = asyncio.get_event_loop()
+        attempts: dict = {}
+        winner = None
+        try:
+            for fam, addr in self._candidates:
+                try:
+                    sock = _nonblocking_socket(fam)
+                except OSError:
+                    continue
+                fut = asyncio.ensure_future(loop.sock_connect(sock, _sockaddr_for(fam, addr, port)))
+                attempts[fut] = (sock, (fam, addr))
+            pending = set(attempts)
+            deadline = loop.time() + self.timeout
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, timeout=max(0.0, deadline - loop.time()),
+                                                   return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    break
+                for fut in done:
+                    if fut.exception() is None and winner is None:
+                        winner, endpoint = attempts[fut]
+                        self._port_addr[port] = endpoint
+        finally:
+            losers = [fut for fut in attempts if not fut.done()]
+            for fut in losers:
+                fut.cancel()
+            if losers:
+                # let the loop drop their writers before the fds are closed and reused
+                await asyncio.wait(losers)
+            for sock, _ in attempts.values():
+                if sock is not winner:
+                    sock.close()
+        return winner
+
+    async def _scan_port_async(self, port: int, do_banner: bool, banner_timeout: float = 2.0):
+        """
+        Probe one port on the event loop. Returns (port, is_open, banner); when do_banner
+        is set the banner is read over the same connection (TLS ports reconnect).
+        Works on a bare non-blocking socket through loop.sock_*, so no transport or
+        stream objects are built for the (mostly closed) ports being probed. Dual-stack
+        targets race their families per port, as scan_port does.
+        """
+        loop = asyncio.get_event_loop()
+        raced = len(self._candidates) > 1
+        try:
+            sock = await self._race_connect_async(port) if raced else _nonblocking_socket(self._endpoint()[0])
+        except OSError:
+            return port, False, None
+        if sock is None:
+            return port, False, None
+        raw = None
+        try:
+            if not raced:
+                try:
+                    await asyncio.wait_for(loop.sock_connect(sock, self._sockaddr(port)), self.timeout)
+                except (OSError, OverflowError, asyncio.TimeoutError):
+                    # OverflowError: a range running past 65535; that port is just closed
+                    return port, False, None
+            _reset_on_close(sock)
+            if do_banner and port not in TLS_PORTS:
                 try:
-                    result = future.result()
-                    if result:
-                        service = self.get_service_name(result)
-                        print(f"[+] Port {result:5d} - OPEN ({service})")
-                        self.open_ports.append(result)
-                        if do_banner:
-                            banner = self.grab_banner(result)
-                            if banner:
-                                print(f"    Banner: {banner.splitlines()[0]}")
-                                self.banners[result] = banner
-                            else:
-                                self.banners[result] = None
-                        if do_service_detect:
-                            detected = self.detect_service_from_banner(result, self.banners.get(result))
-                            self.detected_services[result] = detected
-                    elif verbose:
-                        print(f"[-] Port {port:5d} - CLOSED")
-                except Exception as e:
+                    if port in HTTP_PORTS:
+                        await loop.sock_sendall(sock, self._http_head_req)
+                    raw = await asyncio.wait_for(loop.sock_recv(sock, 4096), min(self.timeout, banner_timeout))
+                except (OSError, asyncio.TimeoutError):
+                    raw = None
+        finally:
+            sock.close()
+        if do_banner and port in TLS_PORTS:
+            raw = await self._tls_banner_async(port, banner_timeout)
+        banner = self._decode_banner(port, raw)
+        return port, True, banner
+
+    def _async_concurrency(self) -> int:
+        """
+        Connects kept in flight by the asyncio engine: ASYNC_CONCURRENCY_FACTOR times
+        --threads, since a waiting socket costs the event loop far less than a thread,
+        capped below the open-file limit so the probes never hit EMFILE. --threads
+        below 1 counts as 1, like the thread engine's worker count.
+        """
+        want = max(1, self.threads) * ASYNC_CONCURRENCY_FACTOR
+        if resource is not None:
+            soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+            if soft != resource.RLIM_INFINITY:
+                want = min(want, max(1, soft - 64))
+        return want
+
+    async def _scan_range_async(self, start_port: int, end_port: int, verbose: bool, do_banner: bool,
+                                concurrency: int) -> dict:
+        """
+        Run `concurrency` worker coroutines that pull ports off one shared iterator
+        (safe: they all run on this thread) and report each result as it comes in.
+        Only the probes in flight exist at any time, not a task per port.
+        """
+        ports = iter(range(start_port, end_port + 1))
+        total_ports = end_port - start_port + 1
+        banners = {}
+        on_open, on_closed, _ = self._make_port_handlers(verbose)
+
+        async def worker() -> None:
+            for port in ports:
+                port, is_open, banner = await self._scan_port_async(port, do_banner)
+                if is_open:
+                    on_open(port)
+                    # always None without do_banner, and _collect_banners ignores it then
+                    banners[port] = banner
+                else:
+                    on_closed(port)
+                self._scanned += 1
+
+        with self._progress_ticker(total_ports):
+            await asyncio.gather(*[worker() for _ in range(max(1, min(concurrency, total_ports)))])
+        return banners
+
+    def scan_range_async(self, start_port: int, end_port: int, verbose: bool = False,
+                         do_banner: bool = False, do_service_detect: bool = False) -> None:
+        """
+        Same contract as scan_range, but every connect runs on one asyncio event loop,
+        with _async_concurrency() connects in flight (worker coroutines rather than threads).
+        Banners are read over the probe connection itself instead of reconnecting.
+        A select()-backed loop (the default on Windows before Python 3.8) is kept
+        under select()'s FD_SETSIZE limit.
+        """
+        # asyncio.run() is 3.7+; drive a private loop by hand to keep 3.6 working
+        loop = asyncio.new_event_loop()
+        concurrency = self._async_concurrency()
+        if isinstance(loop, asyncio.SelectorEventLoop):
+            concurrency = _select_capped(concurrency)
+        # a raced probe holds one socket per family
+        concurrency = max(1, concurrency // len(self._candidates or [None]))
+
+        self._print_scan_header(start_port, end_port, f"asyncio ({concurrency} concurrent)")
+
+        try:
+            banners = loop.run_until_complete(self._scan_range_async(start_port, end_port, verbose, do_banner,
+                                                                     concurrency))
+        finally:
+            loop.close()
+
+        self._collect_banners(do_banner, do_service_detect, banners)
+
+        self._print_scan_summary()
+
+    def _scan_batched(self, start_port: int, end_port: int, batch: int, connect_batch, label: str,
+                      verbose: bool, do_banner: bool, do_service_detect: bool) -> None:
+        """
+        Shared driver for the batched engines. connect_batch(ports) must return
+        (port, status) pairs where status == 0 means the port is open.
+        """
+        self._print_scan_header(start_port, end_port, label)
+
+        total_ports = end_port - start_port + 1
+        all_ports = range(start_port, end_port + 1)
+        on_open, on_closed, _ = self._make_port_handlers(verbose)
+
+        with self._progress_ticker(total_ports):
+            for offset in range(0, total_ports, batch):
+                chunk = all_ports[offset:offset + batch]
+                try:
+                    results = connect_batch(chunk)
+                except OSError as e:
                     if verbose:
-                        print(f"[!] Port {port:5d} - ERROR: {e}")
+                        self._emit(f"[!] Ports {chunk[0]}-{chunk[-1]} - ERROR: {e}")
+                    results = []
+                for port, status in results:
+                    (on_closed if status else on_open)(port)
+                self._scanned += len(chunk)
 
-                if scanned % 100 == 0:
-                    progress = (scanned / total_ports) * 100
-                    print(f"[*] Progress: {progress:.1f}% ({scanned}/{total_ports})")
+        self._collect_banners(do_banner, do_service_detect)
 
-        print(f"\n[*] Scan completed at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"[*] Found {len(self.open_ports)} open ports")
-        if self.open_ports:
-            print(f"\n[*] Open ports: {', '.join(map(str, sorted(self.open_ports)))}")
+        self._print_scan_summary()
+
+    def _range_engine(self, engine: str) -> Callable[..., None]:
+        """The scan_range* method that implements --engine `engine`."""
+        return {
+            'uring': self.scan_range_uring,
+            'epoll': self.scan_range_epoll,
+            'async': self.scan_range_async,
+        }.get(engine, self.scan_range)
+
+    def scan_range_sharded(self, start_port: int, end_port: int, shards: int, engine: str = 'async',
+                           do_banner: bool = False, do_service_detect: bool = False) -> None:
+        """
+        Same contract as scan_range (without verbose), for ranges big enough that the
+        per-port bookkeeping saturates one GIL: the range is cut into `shards`
+        contiguous slices, each scanned by `engine` in its own worker process with its
+        own --threads budget. Open ports are reported here, in port order, as the
+        slices finish; banners are then grabbed from this process as usual.
+        """
+        total_ports = end_port - start_port + 1
+        step = -(-total_ports // shards)
+        bounds = [(lo, min(lo + step - 1, end_port)) for lo in range(start_port, end_port + 1, step)]
+        self._print_scan_header(start_port, end_port, f"{len(bounds)} processes ({engine} engine each)")
+
+        self._endpoint()
+
+        def collect(future) -> None:
+            ports, port_addr = future.result()
+            # keep the family each raced port answered on for the banner grab
+            self._port_addr.update(port_addr)
+            for port in ports:
+                self._report_open_port(port)
+
+        with _worker_pool(len(bounds)) as pool:
+            futures = [pool.submit(_scan_shard_job, self.target, self.addrs, lo, hi, engine,
+                                   self.timeout, self.threads) for lo, hi in bounds]
+            scanned = 0
+            done = 0
+            try:
+                for (lo, hi), future in zip(bounds, futures):
+                    collect(future)
+                    done += 1
+                    scanned += hi - lo + 1
+                    self._progress(scanned, total_ports)
+            except KeyboardInterrupt:
+                # the workers were interrupted too and return what they had found
+                for future in futures[done:]:
+                    try:
+                        collect(future)
+                    except Exception:
+                        pass
+                raise
+
+        self._collect_banners(do_banner, do_service_detect)
+
+        self._print_scan_summary()
 
     def scan_common_ports(self, do_banner: bool = False, do_service_detect: bool = False) -> None:
         print(f"\n[*] Scanning common ports on {self.target} ({self.addr})")
         print(f"[*] Scan started at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
 
-        for port in COMMON_PORTS:
-            result = self.scan_port(port)
-            if result:
-                service = self.get_service_name(result)
-                print(f"[+] Port {result:5d} - OPEN ({service})")
-                self.open_ports.append(result)
-                if do_banner:
-                    banner = self.grab_banner(result)
-                    if banner:
-                        print(f"    Banner: {banner.splitlines()[0]}")
-                        self.banners[result] = banner
-                    else:
-                        self.banners[result] = None
-                if do_service_detect:
-                    detected = self.detect_service_from_banner(result, self.banners.get(result))
-                    self.detected_services[result] = detected
+        self._scan_ports(sorted(COMMON_PORTS))
+        self._collect_banners(do_banner, do_service_detect)
 
         print(f"\n[*] Scan completed at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}" )
         print(f"[*] Found {len(self.open_ports)} open ports")
 
 
+def _ones_sum(data: bytes) -> int:
+    """Unfolded sum of the big-endian 16-bit words of data (padded to an even length)."""
+    if len(data) % 2:
+        data += b'\x00'
+    return sum(struct.unpack(f'!{len(data) // 2}H', data))
+
+
+def _fold_checksum(total: int) -> int:
+    """Fold the carries of a one's-complement sum and complement it (RFC 1071)."""
+    while total >> 16:
+        total = (total & 0xFFFF) + (total >> 16)
+    return ~total & 0xFFFF
+
+
+def _inet_checksum(data: bytes) -> int:
+    """RFC 1071 internet checksum over data."""
+    return _fold_checksum(_ones_sum(data))
+
+
+class SynScanner:
+    """
+    Stateless SYN ("half-open") scanner for IPv4, masscan style: one raw socket sends a
+    SYN per (host, port) pair built from a pre-packed TCP header template, while a
+    second thread reads replies off a raw receive socket and counts SYN/ACK as open
+    (RST means closed). The kernel keeps no connection state for the probes, and its
+    own RST answer to the SYN/ACK tears the half-open connection down. Requires root.
+    """
+
+    TCP_SYN = 0x02
+    TCP_RST = 0x04
+    TCP_ACK = 0x10
+
+    def __init__(self, timeout: float = 1.0):
+        self.timeout = timeout
+        self.src_port = random.randint(40000, 60999)
+        self.seq = random.getrandbits(32)
+        self.open_ports: dict = {}   # host address -> set of open ports
+        self._src_ips: dict = {}
+        # sport, dport, seq, ack, data offset (5 words), flags, window, checksum, urgent
+        self._template = struct.pack('!HHIIBBHHH', self.src_port, 0, self.seq, 0, 5 << 4,
+                                     self.TCP_SYN, 1024, 0, 0)
+        # Checksum of everything that never changes (template with dport = 0 and
+        # checksum = 0, plus protocol and length from the pseudo-header). Per host we
+        # add the two addresses once, per packet only dport: the one's-complement sum
+        # is additive, so each SYN costs one addition and a fold instead of a rescan.
+        self._fixed_sum = _ones_sum(self._template) + socket.IPPROTO_TCP + len(self._template)
+        self._pkt = bytearray(self._template)
+
+    @staticmethod
+    def available() -> bool:
+        return hasattr(socket, 'SOCK_RAW') and hasattr(os, 'geteuid') and os.geteuid() == 0
+
+    def _source_ip(self, host: str) -> str:
+        """Local address the kernel would route to host from (a UDP connect sends nothing)."""
+        if host not in self._src_ips:
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as u:
+                u.connect((host, 9))
+                self._src_ips[host] = u.getsockname()[0]
+        return self._src_ips[host]
+
+    def _host_sum(self, src: str, dst: str) -> int:
+        """
+        Partial checksum for every SYN sent from src to dst, missing only dport,
+        already folded to 16 bits (not complemented).
+        """
+        return ~_fold_checksum(self._fixed_sum + _ones_sum(socket.inet_aton(src) + socket.inet_aton(dst))) & 0xFFFF
+
+    def _sweep(self, sock: socket.socket, host: str, ports: Sequence[int]) -> None:
+        """
+        Send one SYN to every port of host by patching dport and checksum into the
+        shared packet buffer (sendto copies it). The host's partial sum and the port
+        are both 16-bit, so a single carry fold finishes each checksum; everything
+        the loop touches is bound to a local, since it runs once per packet.
+        """
+        host_sum = self._host_sum(self._source_ip(host), host)
+        pkt = self._pkt
+        pack_into = _U16.pack_into
+        sendto = sock.sendto
+        dst = (host, 0)
+        for port in ports:
+            total = host_sum + port
+            pack_into(pkt, 2, port)
+            pack_into(pkt, 16, ((total & 0xFFFF) + (total >> 16)) ^ 0xFFFF)
+            try:
+                sendto(pkt, dst)
+            except OSError as e:
+                if e.errno != errno.ENOBUFS:
+                    raise
+                self._send(sock, pkt, host)
+
+    def _receive(self, sock: socket.socket, hosts: set, stop: threading.Event) -> None:
+        """
+        Classify replies as they arrive. Every inbound TCP segment on the machine
+        passes through here, so each is read into one reused buffer and dropped
+        on the cheapest test first (dport), before its source address is even
+        looked up (as packed bytes, without formatting it).
+        """
+        expected_ack = (self.seq + 1) & 0xFFFFFFFF
+        src_port = self.src_port
+        synack = self.TCP_SYN | self.TCP_ACK
+        wanted = {socket.inet_aton(h): h for h in hosts}
+        buf = bytearray(65535)
+        while not stop.is_set():
+            try:
+                n = sock.recv_into(buf)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            ihl = (buf[0] & 0x0F) * 4
+            if n < ihl + 14:
+                continue
+            sport, dport, _, ack, _, flags = _TCP_REPLY.unpack_from(buf, ihl)
+            if dport != src_port or ack != expected_ack or flags & synack != synack:
+                continue
+            host = wanted.get(bytes(buf[12:16]))
+            if host is not None:
+                self.open_ports.setdefault(host, set()).add(sport)
+
+    @staticmethod
+    def _send(sock: socket.socket, pkt: bytearray, host: str) -> None:
+        while True:
+            try:
+                sock.sendto(pkt, (host, 0))
+                return
+            except OSError as e:
+                if e.errno != errno.ENOBUFS:
+                    raise
+                time.sleep(0.001)  # transmit queue full, let it drain
+
+    def scan(self, hosts: List[str], ports: Sequence[int]) -> dict:
+        """
+        Send one SYN to every (host, port) pair, then wait self.timeout for late replies.
+        hosts must be IPv4 address strings. Returns {host: set(open ports)}.
+        """
+        send_sock = socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_TCP)
+        recv_sock = socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_TCP)
+        recv_sock.settimeout(0.2)
+        # every inbound TCP segment on the host lands here; a deep buffer keeps a
+        # fast sweep from overflowing it and silently dropping SYN/ACKs
+        rcvbuf_force = getattr(socket, 'SO_RCVBUFFORCE', None)
+        try:
+            recv_sock.setsockopt(socket.SOL_SOCKET, rcvbuf_force or socket.SO_RCVBUF, 1 << 23)
+        except OSError:
+            recv_sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 23)
+        stop = threading.Event()
+        receiver = threading.Thread(target=self._receive, args=(recv_sock, set(hosts), stop), daemon=True)
+        receiver.start()
+        try:
+            for host in hosts:
+                try:
+                    self._sweep(send_sock, host, ports)
+                except OSError as e:
+                    print(f"[!] SYN scan of {host} failed: {e}")
+            time.sleep(self.timeout)
+        finally:
+            stop.set()
+            receiver.join()
+            send_sock.close()
+            recv_sock.close()
+        return self.open_ports
+
+
 def parse_ports_spec(ports_spec: Optional[str]) -> Tuple[str, Optional[object]]:
     """
     Returns (mode, data)
@@ -341,6 +1752,20 @@ def parse_ports_spec(ports_spec: Optional[str]) -> Tuple[str, Optional[object]]:
         return ("list", ports)
     return ("single", int(ports_spec))
 
+def expand_ports_spec(ports_mode: str, ports_data) -> Sequence[int]:
+    """
+    Turn parse_ports_spec() output into the ports to probe. A range stays a range
+    object, so a full 1-65535 sweep never builds a 65535-element list.
+    """
+    if ports_mode == "range":
+        start, end = ports_data
+        return range(start, end + 1)
+    if ports_mode == "list":
+        return list(ports_data)
+    if ports_mode == "single":
+        return [ports_data]
+    return sorted(COMMON_PORTS)
+
 def load_targets_from_file(path: str) -> List[str]:
     targets: List[str] = []
     try:
@@ -354,17 +1779,27 @@ def load_targets_from_file(path: str) -> List[str]:
         print(f"[!] Could not read targets file {path}: {e}")
     return targets
 
+def cidr_hosts(target: str) -> List[Target]:
+    """
+    Host addresses of the CIDR network `target`, as ipaddress objects that
+    scan_one_target uses directly without resolving them again.
+    """
+    try:
+        network = ipaddress.ip_network(target, strict=False)
+        hosts: List[Target] = list(network.hosts())
+        if not hosts:
+            raise ValueError("no usable host addresses")
+        return hosts
+    except Exception as e:
+        raise ValueError(f"Invalid network {target}: {e}")
+
 def expand_cidr_if_needed(target: str) -> List[str]:
     """
     If target contains '/', treat it as CIDR and return list of host IP strings.
     Otherwise return [target].
     """
     if '/' in target:
-        try:
-            network = ipaddress.ip_network(target, strict=False)
-            return [str(ip) for ip in network.hosts()] or [str(next(network.hosts()))]
-        except Exception as e:
-            raise ValueError(f"Invalid network {target}: {e}")
+        return [str(ip) for ip in cidr_hosts(target)]
     return [target]
 
 def confirm_prompt(msg: str) -> bool:
@@ -374,43 +1809,114 @@ def confirm_prompt(msg: str) -> bool:
     except Exception:
         return False
 
+def format_text_result(result: dict) -> str:
+    """Human readable block for one result object (the --output-format text layout)."""
+    lines = [
+        f"Scan result for {result.get('target')} ({result.get('addr')})",
+        f"  started_at: {result.get('started_at')}",
+        f"  finished_at: {result.get('finished_at')}",
+        f"  open_ports: {', '.join(map(str, result.get('open_ports', []))) or 'none'}",
+    ]
+    # include banners and detected services in text output
+    if result.get('banners'):
+        lines.append("  banners:")
+        for p, b in result.get('banners', {}).items():
+            lines.append(f"    {p}: {str(b).splitlines()[0] if b else 'None'}")
+    if result.get('detected_services'):
+        lines.append("  detected_services:")
+        for p, s in result.get('detected_services', {}).items():
+            lines.append(f"    {p}: {s}")
+    lines.append("-" * 40)
+    return '\n'.join(lines) + '\n'
+
+class ResultWriter:
+    """
+    Session-wide sink for scan results. The output directory is created and the file
+    opened once, on the first write, and stays open in append mode until close();
+    records are buffered and flushed every FLUSH_EVERY results. Use it as a context
+    manager so an interrupted scan (Ctrl+C) still flushes what it collected.
+    """
+
+    FLUSH_EVERY = 16
+
+    def __init__(self, output_file: Optional[str], output_format: str = 'text', append: bool = True):
+        self.output_file = output_file
+        self.output_format = output_format
+        self.append = append
+        self._fh: Optional[BinaryIO] = None
+        self._unflushed = 0
+        self._failed = False
+
+    def _open(self, path: str) -> BinaryIO:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        fh = open(path, 'ab' if self.append else 'wb', buffering=1 << 16)
+        self._fh = fh
+        return fh
+
+    def write(self, result: dict) -> None:
+        if not self.output_file or self._failed:
+            return
+        try:
+            fh = self._fh if self._fh is not None else self._open(self.output_file)
+            if self.output_format == 'json':
+                # NDJSON: one JSON object per line
+                fh.write(_json_bytes(result) + b'\n')
+            else:
+                fh.write(format_text_result(result).encode('utf-8'))
+            self._unflushed += 1
+            if self._unflushed >= self.FLUSH_EVERY:
+                self.flush()
+        except Exception as e:
+            # report once instead of once per remaining target
+            self._failed = True
+            print(f"[!] Could not write scan result to {self.output_file}: {e}")
+
+    def flush(self) -> None:
+        if self._fh is not None:
+            self._fh.flush()
+            self._unflushed = 0
+
+    def close(self) -> None:
+        if self._fh is not None:
+            try:
+                self._fh.close()
+            except Exception as e:
+                print(f"[!] Could not write scan result to {self.output_file}: {e}")
+            self._fh = None
+
+    def __enter__(self) -> 'ResultWriter':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
 def write_scan_result(
     output_file: Optional[str],
     output_format: str,
     result: dict,
     append: bool = True
 ) -> None:
-    if not output_file:
-        return
-    try:
-        mode = 'a' if append else 'w'
-        os.makedirs(os.path.dirname(output_file), exist_ok=True) if os.path.dirname(output_file) else None
-        if output_format == 'json':
-            # NDJSON: one JSON object per line
-            with open(output_file, mode, encoding='utf-8') as fh:
-                fh.write(json.dumps(result, default=str) + '\n')
-        else:
-            # human readable text
-            with open(output_file, mode, encoding='utf-8') as fh:
-                fh.write(f"Scan result for {result.get('target')} ({result.get('addr')})\n")
-                fh.write(f"  started_at: {result.get('started_at')}\n")
-                fh.write(f"  finished_at: {result.get('finished_at')}\n")
-                fh.write(f"  open_ports: {', '.join(map(str, result.get('open_ports', []))) or 'none'}\n")
-                # include banners and detected services in text output
-                if result.get('banners'):
-                    fh.write("  banners:\n")
-                    for p, b in result.get('banners', {}).items():
-                        fh.write(f"    {p}: {str(b).splitlines()[0] if b else 'None'}\n")
-                if result.get('detected_services'):
-                    fh.write("  detected_services:\n")
-                    for p, s in result.get('detected_services', {}).items():
-                        fh.write(f"    {p}: {s}\n")
-                fh.write("-" * 40 + "\n")
-    except Exception as e:
-        print(f"[!] Could not write scan result to {output_file}: {e}")
+    """One-off write of a single result; prefer a ResultWriter when writing many."""
+    with ResultWriter(output_file, output_format, append=append) as writer:
+        writer.write(result)
+
+def build_result(scanner: 'PortScanner', target: str, started_at: str, finished_at: str) -> dict:
+    """Result object written by write_scan_result for one scanned target."""
+    return {
+        "target": target,
+        "addr": scanner.addr,
+        "family": "ipv6" if scanner.family == socket.AF_INET6 else "ipv4" if scanner.family == socket.AF_INET else None,
+        "started_at": started_at,
+        "finished_at": finished_at,
+        "open_ports": list(scanner.open_ports),
+        "banners": {str(k): v for k, v in scanner.banners.items()},
+        "detected_services": {str(k): v for k, v in scanner.detected_services.items()}
+    }
 
 def scan_one_target(
-    target: str,
+    target: Target,
     ports_mode: str,
     ports_data,
     verbose: bool,
@@ -419,46 +1925,51 @@ def scan_one_target(
     output_file: Optional[str],
     output_format: str,
     do_banner: bool,
-    do_service_detect: bool
-) -> None:
-    scanner = PortScanner(target, timeout=timeout, threads=threads)
-    if not scanner.resolve_target():
-        return
+    do_service_detect: bool,
+    engine: str = 'async',
+    show_progress: bool = True,
+    writer: Optional[ResultWriter] = None,
+    shards: int = 1
+) -> Optional[dict]:
+    """
+    Scan one target and write its result object through writer (or to output_file).
+    A range longer than SHARD_MIN_PORTS is split across `shards` processes (unless
+    verbose, which wants every closed port printed live).
+    Returns the result object, or None when the target does not resolve.
+    """
+    if isinstance(target, str):
+        scanner = PortScanner(target, timeout=timeout, threads=threads, show_progress=show_progress)
+        if not scanner.resolve_target():
+            return None
+    else:
+        # CIDR hosts arrive as ipaddress objects: nothing left to parse or resolve
+        addr = str(target)
+        scanner = PortScanner.from_resolved(addr, socket.AF_INET6 if target.version == 6 else socket.AF_INET,
+                                            addr, timeout=timeout, threads=threads, show_progress=show_progress)
 
     started_at = datetime.now().isoformat()
     try:
         if ports_mode == "range":
             start, end = ports_data
-            scanner.scan_range(start, end, verbose=verbose, do_banner=do_banner, do_service_detect=do_service_detect)
+            if shards > 1 and end - start + 1 > SHARD_MIN_PORTS and not verbose:
+                scanner.scan_range_sharded(start, end, shards, engine,
+                                           do_banner=do_banner, do_service_detect=do_service_detect)
+            else:
+                scanner._range_engine(engine)(start, end, verbose=verbose, do_banner=do_banner,
+                                              do_service_detect=do_service_detect)
         elif ports_mode == "list":
             ports = ports_data
             print(f"\n[*] Scanning specific ports on {scanner.target} ({scanner.addr})")
             print(f"[*] Ports: {', '.join(map(str, ports))}\n")
-            for port in ports:
-                result = scanner.scan_port(port)
-                if result:
-                    service = scanner.get_service_name(result)
-                    print(f"[+] Port {result:5d} - OPEN ({service})")
-                    scanner.open_ports.append(result)
-                    if do_banner:
-                        banner = scanner.grab_banner(result)
-                        if banner:
-                            print(f"    Banner: {banner.splitlines()[0]}")
-                            scanner.banners[result] = banner
-                        else:
-                            scanner.banners[result] = None
-                    if do_service_detect:
-                        detected = scanner.detect_service_from_banner(result, scanner.banners.get(result))
-                        scanner.detected_services[result] = detected
-                elif verbose:
-                    print(f"[-] Port {port:5d} - CLOSED")
+            scanner._scan_ports(ports, verbose)
+            scanner._collect_banners(do_banner, do_service_detect)
         elif ports_mode == "single":
             port = ports_data
             result = scanner.scan_port(port)
             if result:
                 service = scanner.get_service_name(result)
                 print(f"[+] Port {result} is OPEN ({service})")
-                scanner.open_ports.append(result)
+                bisect.insort(scanner.open_ports, result)
                 if do_banner:
                     banner = scanner.grab_banner(result)
                     if banner:
@@ -475,26 +1986,166 @@ def scan_one_target(
             scanner.scan_common_ports(do_banner=do_banner, do_service_detect=do_service_detect)
 
     except KeyboardInterrupt:
+        scanner._flush_output()
         print("\n\n[!] Scan interrupted by user")
         # Still attempt to log partial results
     except Exception as e:
+        scanner._flush_output()
         print(f"\n[!] Error while scanning {target}: {e}")
     finished_at = datetime.now().isoformat()
 
     # Prepare result object and write if requested
-    result_obj = {
-        "target": target,
-        "addr": scanner.addr,
-        "family": "ipv6" if scanner.family == socket.AF_INET6 else "ipv4" if scanner.family == socket.AF_INET else None,
-        "started_at": started_at,
-        "finished_at": finished_at,
-        "open_ports": sorted(scanner.open_ports),
-        "banners": {str(k): v for k, v in scanner.banners.items()},
-        "detected_services": {str(k): v for k, v in scanner.detected_services.items()}
-    }
-    write_scan_result(output_file, output_format, result_obj, append=True)
+    result_obj = build_result(scanner, scanner.target, started_at, finished_at)
+    if writer is not None:
+        writer.write(result_obj)
+    else:
+        write_scan_result(output_file, output_format, result_obj, append=True)
+    return result_obj
+
+
+def _ignore_sigint() -> None:
+    """Pool initializer: idle workers leave Ctrl+C to the parent (see _scan_target_job)."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _worker_pool(max_workers: int) -> ProcessPoolExecutor:
+    """
+    A process pool whose idle workers ignore Ctrl+C. ProcessPoolExecutor only takes an
+    initializer from Python 3.7; on 3.6 a worker ignores it once its first job returns.
+    """
+    if sys.version_info >= (3, 7):
+        return ProcessPoolExecutor(max_workers=max_workers, initializer=_ignore_sigint)
+    return ProcessPoolExecutor(max_workers=max_workers)
+
+
+def _scan_target_job(target: Target, scan_kwargs: dict) -> Tuple[str, Optional[dict]]:
+    """
+    Worker half of scan_targets_parallel: scan one target with its console output
+    captured, and hand (output, result object) back to the parent to print and write.
+    Ctrl+C is only honoured while scanning, so an interrupted scan still returns its
+    partial result.
+    """
+    out = io.StringIO()
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+    try:
+        with contextlib.redirect_stdout(out):
+            result = scan_one_target(target=target, output_file=None, writer=None, **scan_kwargs)
+    finally:
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+    return out.getvalue(), result
+
+
+def _scan_shard_job(target: str, addrs: List[Tuple[int, str]], start_port: int, end_port: int,
+                    engine: str, timeout: float, threads: int) -> Tuple[Sequence[int], dict]:
+    """
+    Worker half of PortScanner.scan_range_sharded: scan one slice of the range with
+    its console output discarded and return the open ports found (so far, when
+    Ctrl+C cut the slice short) along with the family each raced port answered on.
+    The slice gets the parent's whole resolution, so dual-stack targets still race.
+    """
+    scanner = PortScanner(target, timeout=timeout, threads=threads, show_progress=False)
+    scanner._set_addrs(addrs)
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            scanner._range_engine(engine)(start_port, end_port)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+    return scanner.open_ports, scanner._port_addr
+
+
+def scan_targets_parallel(targets: List[Target], jobs: int, scan_kwargs: dict, writer: ResultWriter) -> None:
+    """
+    Scan targets in a pool of `jobs` processes, each running the same per-target scan
+    as the sequential path (so every process has its own GIL and thread pool). Each
+    target's console output is printed as one block, and its result written, in
+    target order as soon as all targets before it are done.
+    """
+    def report(job: Tuple[str, Optional[dict]]) -> None:
+        text, result = job
+        sys.stdout.write(text)
+        sys.stdout.flush()
+        if result is not None:
+            writer.write(result)
+
+    with _worker_pool(jobs) as pool:
+        futures = [pool.submit(_scan_target_job, target, scan_kwargs) for target in targets]
+        done = 0
+        try:
+            for future in futures:
+                report(future.result())
+                done += 1
+        except KeyboardInterrupt:
+            print("\n\n[!] Scan interrupted by user")
+            pending = futures[done:]
+            for future in pending:
+                future.cancel()
+            # scans already running were interrupted too and return partial results
+            for future in pending:
+                if not future.cancelled():
+                    try:
+                        report(future.result())
+                    except Exception:
+                        pass
+
+def syn_scan_targets(targets: List[Target], ports_mode: str, ports_data, args, writer: ResultWriter) -> List[Target]:
+    """
+    SYN-scan every IPv4 target in one raw-socket sweep over all (host, port) pairs.
+    Returns the targets it could not handle (IPv6, unresolvable, or everything when
+    not running as root) so the caller can give them the regular connect scan.
+    """
+    if not SynScanner.available():
+        print("[!] --syn-scan needs root privileges and raw sockets; falling back to TCP connect scan")
+        return targets
+    ports = expand_ports_spec(ports_mode, ports_data)
+    # a SYN's dport is 16 bits, so ports past 65535 cannot be sent at all
+    if isinstance(ports, range):
+        ports = range(max(ports.start, 0), min(ports.stop, 0x10000))
+    else:
+        ports = [p for p in ports if 0 <= p <= 0xFFFF]
+    ipv4: List[Tuple[str, str]] = []
+    rest: List[Target] = []
+    for t in targets:
+        if not isinstance(t, str):
+            addr = str(t) if t.version == 4 else None
+        else:
+            try:
+                addr = next((a for fam, a in _resolve(t) if fam == socket.AF_INET), None)
+            except Exception:
+                addr = None
+        if addr:
+            ipv4.append((str(t), addr))
+        else:
+            rest.append(t)
+    if not ipv4:
+        return rest
+
+    hosts = sorted({addr for _, addr in ipv4})
+    syn = SynScanner(timeout=args.timeout)
+    print(f"\n[*] SYN scan of {len(hosts)} hosts x {len(ports)} ports (source port {syn.src_port})")
+    started_at = datetime.now().isoformat()
+    try:
+        found = syn.scan(hosts, ports)
+    except OSError as e:
+        print(f"[!] SYN scan failed ({e}); falling back to TCP connect scan")
+        return targets
+    finished_at = datetime.now().isoformat()
+
+    for target, addr in ipv4:
+        scanner = PortScanner.from_resolved(target, socket.AF_INET, addr, timeout=args.timeout,
+                                            threads=args.threads, show_progress=not args.quiet_progress)
+        print(f"\n[*] Results for {target} ({addr})")
+        for port in sorted(found.get(addr, ())):
+            scanner._report_open_port(port)
+        scanner._collect_banners(args.banner, args.service_detect)
+        print(f"[*] Found {len(scanner.open_ports)} open ports")
+        writer.write(build_result(scanner, target, started_at, finished_at))
+    return rest
+
 
-def main():
+def main() -> None:
     parser = argparse.ArgumentParser(
         description="Simple and effective port scanner (IPv4 & IPv6)",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -521,6 +2172,18 @@ Examples:
                        help='Socket timeout in seconds (default: 1.0)')
     parser.add_argument('--threads', type=int, default=100,
                        help='Number of threads per-target (default: 100)')
+    parser.add_argument('--jobs', type=int, default=0,
+                       help='Targets scanned in parallel, one process each (default: 2x CPU count); a '
+                            'single target splits ranges over %d ports across as many processes instead '
+                            '(default: CPU count). 1 keeps the scan in one process with live output' % SHARD_MIN_PORTS)
+    parser.add_argument('--engine', choices=['thread', 'uring', 'epoll', 'async'], default='async',
+                       help='Connect engine for port ranges: thread pool, batched io_uring on Linux, '
+                            'a single-threaded epoll/selector window, or an asyncio event loop '
+                            '(--threads sets the pool size; io_uring, epoll and asyncio keep 10x that '
+                            'many connects in flight). Default: async')
+    parser.add_argument('--syn-scan', action='store_true',
+                       help='Stateless raw-socket SYN scan of all IPv4 targets in one sweep (requires root; '
+                            'other targets and non-root runs use the TCP connect scan)')
     parser.add_argument('--max-hosts', type=int, default=256,
                        help='Max number of hosts to expand for a CIDR target before prompting (default: 256)')
     parser.add_argument('--force-network-scan', action='store_true',
@@ -528,12 +2191,19 @@ Examples:
     parser.add_argument('--output-file', help='Write scan results to this file (append). For JSON use --output-format json')
     parser.add_argument('--output-format', choices=['text', 'json'], default='text',
                        help='Output format for --output-file: text or json (NDJSON). Default: text')
+    parser.add_argument('--quiet-progress', action='store_true',
+                       help='Do not print progress lines during range scans (useful in CI logs)')
     parser.add_argument('--no-color', action='store_true',
                        help='Disable colored output (not used by default, placeholder for future)')
     parser.add_argument('--banner', action='store_true', help='Attempt banner grabbing on open ports')
     parser.add_argument('--service-detect', action='store_true', help='Attempt simple service detection from banners')
     args = parser.parse_args()
 
+    # Scan output is flushed explicitly in batches; don't let a TTY force a
+    # write(2) per line (reconfigure() is Python 3.7+)
+    if hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(line_buffering=False, write_through=False)
+
     # Banner
     print("=" * 60)
     print("Port Scanner v1.2")
@@ -557,7 +2227,7 @@ Examples:
     ports_mode, ports_data = parse_ports_spec(args.ports)
 
     # Expand CIDRs into concrete host lists, with safety checks
-    expanded_targets: List[str] = []
+    expanded_targets: List[Target] = []
     for t in targets:
         if '/' in t:
             try:
@@ -569,8 +2239,7 @@ Examples:
                     if not confirm_prompt("Do you want to continue scanning this network?"):
                         print(f"[*] Skipping {t}")
                         continue
-                hosts = expand_cidr_if_needed(t)
-                expanded_targets.extend(hosts)
+                expanded_targets.extend(cidr_hosts(t))
             except Exception as e:
                 print(f"[!] Skipping {t}: {e}")
         else:
@@ -580,20 +2249,38 @@ Examples:
         print("[!] No valid targets after expansion.")
         sys.exit(1)
 
-    # Scan each target sequentially
-    for host in expanded_targets:
-        scan_one_target(
-            target=host,
+    # One output handle for the whole session; closing it flushes, even on Ctrl+C
+    with ResultWriter(args.output_file, args.output_format) as writer:
+        if args.syn_scan:
+            expanded_targets = syn_scan_targets(expanded_targets, ports_mode, ports_data, args, writer)
+
+        scan_kwargs = dict(
             ports_mode=ports_mode,
             ports_data=ports_data,
             verbose=args.verbose,
             timeout=args.timeout,
             threads=args.threads,
-            output_file=args.output_file,
             output_format=args.output_format,
             do_banner=args.banner,
-            do_service_detect=args.service_detect
+            do_service_detect=args.service_detect,
+            engine=args.engine,
+            show_progress=not args.quiet_progress
         )
+        jobs = min(len(expanded_targets), args.jobs or 2 * (os.cpu_count() or 1))
+        if jobs > 1:
+            scan_targets_parallel(expanded_targets, jobs, scan_kwargs, writer)
+        else:
+            # Scan each target sequentially; a lone target's big range can still use
+            # the processes instead (--jobs 1 keeps everything in this one)
+            shards = 1 if args.jobs == 1 else args.jobs or (os.cpu_count() or 1)
+            for host in expanded_targets:
+                scan_one_target(target=host, output_file=args.output_file, writer=writer, shards=shards,
+                                **scan_kwargs)
 
 if __name__ == "__main__":
-    main()
+    # hand off to a mypyc build of this module next to the script, if one was made
+    _spec = importlib.util.find_spec('port_scanner')
+    if _spec is not None and str(_spec.origin).endswith(tuple(importlib.machinery.EXTENSION_SUFFIXES)):
+        importlib.import_module('port_scanner').main()
+    else:
+        main()